@@ -1,10 +1,17 @@
 
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, g, session, has_request_context, abort
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import date, datetime
+import click
+import itertools
 import os
+import sqlite3
+import tempfile
+import time
+import sqlalchemy as sa
 from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from sqlalchemy import func, case
@@ -21,8 +28,75 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get("SECRET_KEY", "dev-secret-change-me")
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get("DATABASE_URL", "sqlite:///app.db")
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['MY_TASKS_PAGE_SIZE'] = int(os.environ.get("MY_TASKS_PAGE_SIZE", "50"))
+app.config['NOTIFICATION_PAGE_SIZE'] = int(os.environ.get("NOTIFICATION_PAGE_SIZE", "50"))
+# 0 = một câu UPDATE duy nhất; > 0 = cập nhật theo lô
+app.config['NOTIFICATION_MARK_READ_BATCH'] = int(os.environ.get("NOTIFICATION_MARK_READ_BATCH", "500"))
+app.config['NOTIFICATION_RETENTION_DAYS'] = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", "90"))
+
+# -------------------- Read replicas --------------------
+# DATABASE_REPLICA_URLS="sqlite:///replica1.db,sqlite:///replica2.db" (cách nhau bởi dấu phẩy)
+REPLICA_URLS = [u.strip() for u in os.environ.get("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+app.config['SQLALCHEMY_BINDS'] = {f"replica_{i}": url for i, url in enumerate(REPLICA_URLS)}
+# Sau khi ghi, các request GET của user này đọc từ primary trong N giây (read-your-writes)
+app.config['REPLICA_STICKY_SECONDS'] = int(os.environ.get("REPLICA_STICKY_SECONDS", "10"))
+REPLICA_KEYS = list(app.config['SQLALCHEMY_BINDS'])
+_replica_counter = itertools.count()
+
+
+class RoutingSession(Session):
+    """Session đọc từ replica khi request cho phép, mọi lệnh ghi luôn đi về primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_request_context():
+            if self._flushing or isinstance(clause, sa.UpdateBase):
+                # Có ghi -> phần còn lại của request (và cửa sổ sticky) dùng primary
+                g.replica_key = None
+                g.db_wrote = True
+            elif g.get("replica_key"):
+                return self._db.engines[g.replica_key]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def primary_db(view):
+    """Đánh dấu view GET có ghi DB để luôn chạy trên primary."""
+    view.use_primary = True
+    return view
+
+
+db = SQLAlchemy(app, session_options={"class_": RoutingSession})
+
+
+@sa.event.listens_for(sa.engine.Engine, "connect")
+def sqlite_foreign_keys(dbapi_conn, conn_record):
+    # SQLite chỉ áp dụng ON DELETE CASCADE / SET NULL khi bật foreign_keys
+    if isinstance(dbapi_conn, sqlite3.Connection):
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA foreign_keys=ON")
+        cur.close()
+
+
+@app.before_request
+def choose_db_bind():
+    g.replica_key = None
+    if not REPLICA_KEYS or request.method != "GET":
+        return
+    view = app.view_functions.get(request.endpoint)
+    if view is None or getattr(view, "use_primary", False):
+        return
+    if session.get("rw_until", 0) > time.time():
+        return
+    # round-robin, chọn 1 replica cho cả request để dữ liệu nhất quán
+    g.replica_key = REPLICA_KEYS[next(_replica_counter) % len(REPLICA_KEYS)]
+
+
+@app.after_request
+def remember_db_write(response):
+    if REPLICA_KEYS and g.get("db_wrote"):
+        session["rw_until"] = time.time() + app.config['REPLICA_STICKY_SECONDS']
+    return response
+
 
-db = SQLAlchemy(app)
 @app.context_processor
 def inject_unread():
     if current_user.is_authenticated:
@@ -42,8 +116,9 @@ login_manager.login_view = "login"
 # -------------------- Association Table (Task - User) --------------------
 task_assignees = db.Table(
     "task_assignees",
-    db.Column("task_id", db.Integer, db.ForeignKey("task.id"), primary_key=True),
-    db.Column("user_id", db.Integer, db.ForeignKey("user.id"), primary_key=True),
+    db.Column("task_id", db.Integer, db.ForeignKey("task.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("user_id", db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_task_assignees_user_id", "user_id"),
 )
 
 # -------------------- Models --------------------
@@ -63,15 +138,15 @@ class Board(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text, default="")
-    owner_id = db.Column(db.Integer, db.ForeignKey("user.id"))
-    owner = db.relationship("User", backref="boards")
+    owner_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"))
+    owner = db.relationship("User", backref=db.backref("boards", passive_deletes=True))
 
 class List(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
     position = db.Column(db.Integer, default=0)
-    board_id = db.Column(db.Integer, db.ForeignKey("board.id"), nullable=False)
-    board = db.relationship("Board", backref=db.backref("lists", cascade="all, delete-orphan", order_by="List.position"))
+    board_id = db.Column(db.Integer, db.ForeignKey("board.id", ondelete="CASCADE"), nullable=False, index=True)
+    board = db.relationship("Board", backref=db.backref("lists", cascade="all, delete-orphan", passive_deletes=True, order_by="List.position"))
 
 class Task(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -87,14 +162,15 @@ class Task(db.Model):
     percentage = db.Column(db.Integer, default=0)                # 0,25,50,75,100
     priority = db.Column(db.String(10), default="Normal")        # Low, Normal, High, Urgent
 
-    list_id = db.Column(db.Integer, db.ForeignKey("list.id"), nullable=False)
-    list = db.relationship("List", backref=db.backref("tasks", cascade="all, delete-orphan", order_by="Task.position"))
-    created_by_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    list_id = db.Column(db.Integer, db.ForeignKey("list.id", ondelete="CASCADE"), nullable=False, index=True)
+    list = db.relationship("List", backref=db.backref("tasks", cascade="all, delete-orphan", passive_deletes=True, order_by="Task.position"))
+    created_by_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True, index=True)
     created_by = db.relationship("User", foreign_keys=[created_by_id])
 
 
     # Many-to-many assignees
-    assignees = db.relationship("User", secondary=task_assignees, backref="assigned_tasks")
+    assignees = db.relationship("User", secondary=task_assignees, passive_deletes=True,
+                                backref=db.backref("assigned_tasks", passive_deletes=True))
 
 # -------------------- Auth --------------------
 @app.route("/register", methods=["GET", "POST"])
@@ -370,6 +446,69 @@ def add_task(list_id):
     flash("Đã thêm công việc.", "success")
     return redirect(url_for("view_board", board_id=lst.board_id))
 
+# -------------------- Set-based deletes --------------------
+# Xoá bằng vài câu lệnh DELETE/UPDATE theo tập hợp, không load từng object vào ORM.
+# Schema đã khai báo ON DELETE, nhưng vẫn xoá tường minh để DB cũ (SQLite không
+# ALTER được foreign key) cũng không để lại task_assignees / Notification mồ côi.
+def _bulk(stmt, sess=None):
+    return (sess or db.session).execute(stmt.execution_options(synchronize_session=False))
+
+def delete_tasks_where(task_ids, sess=None):
+    """task_ids: list id hoặc subquery select(Task.id)."""
+    _bulk(sa.delete(task_assignees).where(task_assignees.c.task_id.in_(task_ids)), sess)
+    _bulk(sa.update(Notification).where(Notification.task_id.in_(task_ids)).values(task_id=None), sess)
+    return _bulk(sa.delete(Task).where(Task.id.in_(task_ids)), sess).rowcount
+
+def delete_list_rows(list_id: int, sess=None):
+    delete_tasks_where(sa.select(Task.id).where(Task.list_id == list_id), sess)
+    _bulk(sa.delete(List).where(List.id == list_id), sess)
+
+def delete_board_rows(board_id: int, sess=None):
+    list_ids = sa.select(List.id).where(List.board_id == board_id)
+    n = delete_tasks_where(sa.select(Task.id).where(Task.list_id.in_(list_ids)), sess)
+    _bulk(sa.delete(List).where(List.board_id == board_id), sess)
+    _bulk(sa.delete(Board).where(Board.id == board_id), sess)
+    return n
+
+def can_manage_board(board) -> bool:
+    # cùng quy tắc với dashboard: board của mình hoặc board chung (không có owner)
+    return board.owner_id is None or board.owner_id == current_user.id
+
+def delete_user_rows(user_id: int):
+    _bulk(sa.delete(task_assignees).where(task_assignees.c.user_id == user_id))
+    _bulk(sa.delete(Notification).where(Notification.user_id == user_id))
+    _bulk(sa.delete(NotificationArchive).where(NotificationArchive.user_id == user_id))
+    _bulk(sa.update(Notification).where(Notification.actor_id == user_id).values(actor_id=None))
+    _bulk(sa.update(Task).where(Task.created_by_id == user_id).values(created_by_id=None))
+    _bulk(sa.update(Board).where(Board.owner_id == user_id).values(owner_id=None))
+    _bulk(sa.delete(User).where(User.id == user_id))
+
+
+@app.route("/boards/<int:board_id>/delete", methods=["POST"])
+@login_required
+def delete_board(board_id):
+    board = Board.query.get_or_404(board_id)
+    if not can_manage_board(board):
+        abort(403)
+    name = board.name
+    delete_board_rows(board.id)
+    db.session.commit()
+    flash(f"Đã xoá board {name}.", "info")
+    return redirect(url_for("boards_page"))
+
+
+@app.route("/lists/<int:list_id>/delete", methods=["POST"])
+@login_required
+def delete_list(list_id):
+    lst = List.query.get_or_404(list_id)
+    if not can_manage_board(lst.board):
+        abort(403)
+    board_id = lst.board_id
+    delete_list_rows(lst.id)
+    db.session.commit()
+    flash("Đã xoá danh sách.", "info")
+    return redirect(url_for("view_board", board_id=board_id))
+
 # Helper gom dữ liệu cho Summary (nếu chưa có)
 def build_summary_for_board(board_id: int):
     q = Task.query.join(List).filter(List.board_id == board_id)
@@ -406,7 +545,7 @@ def all_summary():
 def delete_task(task_id):
     t = Task.query.get_or_404(task_id)
     board_id = t.list.board_id
-    db.session.delete(t)
+    delete_tasks_where([t.id])
     db.session.commit()
     flash("Đã xoá công việc.", "info")
     return redirect(url_for("view_board", board_id=board_id))
@@ -465,6 +604,166 @@ def update_task(task_id):
     return redirect(url_for("view_board", board_id=t.list.board_id))
 
 
+def _bulk_ids(data, name):
+    """Lấy (list id hợp lệ, list giá trị không phải id) từ JSON hoặc form.
+
+    Với JSON, giá trị phải là mảng; sai kiểu thì raise ValueError.
+    """
+    if request.is_json:
+        raw = data.get(name)
+        if raw is None:
+            return [], []
+        if not isinstance(raw, list):
+            raise ValueError(f"{name} phải là danh sách id.")
+    else:
+        raw = request.form.getlist(name)
+    ids, invalid = [], []
+    for x in raw:
+        if isinstance(x, int) and not isinstance(x, bool):
+            ids.append(x)
+        elif isinstance(x, str) and x.strip().lstrip("-").isdigit():
+            ids.append(int(x))
+        else:
+            invalid.append(x)
+    return list(dict.fromkeys(ids)), invalid
+
+
+@app.route("/tasks/bulk", methods=["POST"])
+@login_required
+def bulk_update_tasks():
+    """Áp dụng status/priority/percentage/assignee cho nhiều task bằng vài câu lệnh."""
+    data = request.get_json(silent=True) if request.is_json else request.form
+    board_id = request.form.get("board_id", type=int)
+    back = url_for("view_board", board_id=board_id) if board_id else url_for("all_tasks")
+
+    def fail(message):
+        if request.is_json:
+            return jsonify(error=message), 400
+        flash(message, "danger")
+        return redirect(back)
+
+    if request.is_json and not isinstance(data, dict):
+        return fail("Body JSON phải là một object.")
+    try:
+        task_ids, invalid_task_ids = _bulk_ids(data, "task_ids")
+        add_ids, invalid_add = _bulk_ids(data, "add_assignees")
+        remove_ids, invalid_remove = _bulk_ids(data, "remove_assignees")
+    except ValueError as e:
+        return fail(str(e))
+    if invalid_add or invalid_remove:
+        return fail("Danh sách assignee chứa id không hợp lệ.")
+    for field in ("status", "priority"):
+        if data.get(field) is not None and not isinstance(data.get(field), str):
+            return fail(f"{field} phải là chuỗi.")
+
+    values = {}
+    status = (data.get("status") or "").strip()
+    if status:
+        if status not in ["In process", "Done", "OverDue"]:
+            return fail(f"Status không hợp lệ: {status}")
+        values["status"] = status
+    priority = (data.get("priority") or "").strip()
+    if priority:
+        if priority not in ["Low", "Normal", "High", "Urgent"]:
+            return fail(f"Priority không hợp lệ: {priority}")
+        values["priority"] = priority
+    percentage = data.get("percentage")
+    if percentage not in (None, ""):
+        try:
+            percentage = int(percentage)
+        except (TypeError, ValueError):
+            percentage = None
+        if percentage not in [0, 25, 50, 75, 100]:
+            return fail("Percentage phải là 0, 25, 50, 75 hoặc 100.")
+        values["percentage"] = percentage
+
+    if not values and not add_ids and not remove_ids:
+        return fail("Không có thay đổi nào để áp dụng.")
+    if not task_ids and not invalid_task_ids:
+        return fail("Chưa chọn task nào.")
+
+    rows = db.session.execute(
+        sa.select(Task.id, Task.title, Task.status, Task.priority, Task.percentage, Task.created_by_id)
+        .where(Task.id.in_(task_ids))
+    ).all()
+    found = {r.id: r for r in rows}
+    ids = list(found)
+    changes = {tid: [] for tid in ids}
+
+    # 1) Trường đơn: 1 câu UPDATE
+    if ids and values:
+        _bulk(sa.update(Task).where(Task.id.in_(ids)).values(**values))
+        for tid in ids:
+            changes[tid].extend(f for f, v in values.items() if getattr(found[tid], f) != v)
+
+    # 2) Assignees: 1 câu INSERT (executemany) + 1 câu DELETE
+    added_pairs = []
+    if ids and add_ids:
+        valid_users = set(db.session.scalars(sa.select(User.id).where(User.id.in_(add_ids))))
+        existing = set(db.session.execute(
+            sa.select(task_assignees.c.task_id, task_assignees.c.user_id)
+            .where(task_assignees.c.task_id.in_(ids), task_assignees.c.user_id.in_(valid_users))
+        ).all())
+        added_pairs = [(tid, uid) for tid in ids for uid in add_ids
+                       if uid in valid_users and (tid, uid) not in existing]
+        if added_pairs:
+            db.session.execute(sa.insert(task_assignees),
+                               [{"task_id": tid, "user_id": uid} for tid, uid in added_pairs])
+            for tid in {tid for tid, _ in added_pairs}:
+                changes[tid].append("add_assignees")
+    if ids and remove_ids:
+        removed = db.session.execute(
+            sa.select(task_assignees.c.task_id)
+            .where(task_assignees.c.task_id.in_(ids), task_assignees.c.user_id.in_(remove_ids))
+            .distinct()
+        ).scalars().all()
+        if removed:
+            _bulk(sa.delete(task_assignees).where(
+                task_assignees.c.task_id.in_(ids), task_assignees.c.user_id.in_(remove_ids)))
+            for tid in removed:
+                changes[tid].append("remove_assignees")
+
+    # 3) Thông báo: gom lại, 1 câu INSERT
+    notifs = []
+    for tid, uid in added_pairs:
+        if uid != current_user.id:
+            notifs.append({"user_id": uid, "task_id": tid, "type": "assigned", "actor_id": current_user.id,
+                           "message": f'{current_user.name} đã giao thêm cho bạn: "{found[tid].title}".'})
+    completed = [tid for tid in ids if values.get("status") == "Done" and found[tid].status != "Done"]
+    if completed:
+        receivers = {tid: set() for tid in completed}
+        for tid in completed:
+            if found[tid].created_by_id:
+                receivers[tid].add(found[tid].created_by_id)
+        for tid, uid in db.session.execute(
+            sa.select(task_assignees.c.task_id, task_assignees.c.user_id)
+            .where(task_assignees.c.task_id.in_(completed))
+        ):
+            receivers[tid].add(uid)
+        for tid in completed:
+            for uid in receivers[tid] - {current_user.id}:
+                notifs.append({"user_id": uid, "task_id": tid, "type": "completed", "actor_id": current_user.id,
+                               "message": f'Task "{found[tid].title}" đã hoàn thành.'})
+    if notifs:
+        db.session.execute(sa.insert(Notification), notifs)
+    db.session.commit()
+
+    results = []
+    for tid in task_ids:
+        if tid in found:
+            results.append({"id": tid, "ok": True, "changed": changes[tid],
+                            "completed": tid in completed})
+        else:
+            results.append({"id": tid, "ok": False, "error": "not found"})
+    results.extend({"id": raw, "ok": False, "error": "invalid id"} for raw in invalid_task_ids)
+    updated = sum(1 for tid in ids if changes[tid])
+
+    if request.is_json:
+        return jsonify(results=results, updated=updated, notifications=len(notifs))
+    flash(f"Đã cập nhật {updated} task.", "success")
+    return redirect(back)
+
+
 
 
 @app.route("/members")
@@ -552,17 +851,35 @@ def chart():
     )
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True, nullable=False)
-    task_id = db.Column(db.Integer, db.ForeignKey("task.id"), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)  # index: ix_notification_inbox
+    task_id = db.Column(db.Integer, db.ForeignKey("task.id", ondelete="SET NULL"), nullable=True, index=True)
     type = db.Column(db.String(20))          # 'assigned' | 'completed' | 'overdue'
     message = db.Column(db.String(300))
-    is_read = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    actor_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)  # người tạo ra sự kiện
+    is_read = db.Column(db.Boolean, default=False, server_default=sa.false(), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    actor_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True)  # người tạo ra sự kiện
 
     user = db.relationship("User", foreign_keys=[user_id])
     actor = db.relationship("User", foreign_keys=[actor_id])
-    task = db.relationship("Task")
+    task = db.relationship("Task", backref=db.backref("notifications", passive_deletes=True))
+
+    # Khớp đúng thứ tự sắp xếp của trang Notifications (keyset pagination)
+    __table_args__ = (
+        db.Index("ix_notification_inbox", user_id, is_read, created_at.desc(), id.desc()),
+    )
+
+class NotificationArchive(db.Model):
+    """Thông báo đã đọc và quá hạn lưu giữ, chuyển ra khỏi bảng notification."""
+    id = db.Column(db.Integer, primary_key=True)
+    notification_id = db.Column(db.Integer, nullable=False)  # id gốc, có thể bị SQLite cấp lại
+    user_id = db.Column(db.Integer, index=True, nullable=False)
+    task_id = db.Column(db.Integer, nullable=True)
+    actor_id = db.Column(db.Integer, nullable=True)
+    type = db.Column(db.String(20))
+    message = db.Column(db.String(300))
+    created_at = db.Column(db.DateTime, nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
 def notify(user: User, typ: str, task: Task | None, actor: User | None, message: str) -> None:
     n = Notification(
         user_id=user.id,
@@ -575,6 +892,7 @@ def notify(user: User, typ: str, task: Task | None, actor: User | None, message:
 
 
 @app.route("/notifications", methods=["GET", "POST"])
+@primary_db
 @login_required
 def notifications():
     today = date.today()
@@ -595,12 +913,16 @@ def notifications():
     )
     overdue_by_me = overdue_q.filter(Task.created_by_id == current_user.id).all()
 
-    # tạo noti overdue nếu chưa có
+    # tạo noti overdue nếu chưa có (kể cả bản đã chuyển sang notification_archive)
     for t in set(overdue_for_me + overdue_by_me):
         exists = (
             Notification.query
             .filter_by(user_id=current_user.id, task_id=t.id, type="overdue")  # <<=== dùng type
             .first()
+        ) or (
+            NotificationArchive.query
+            .filter_by(user_id=current_user.id, task_id=t.id, type="overdue")
+            .first()
         )
         if not exists:
             notify(current_user, "overdue", t, None, f"Task “{t.title}” đã quá hạn.")  # truyền "overdue"
@@ -608,24 +930,93 @@ def notifications():
 
     # đánh dấu tất cả đã đọc
     if request.method == "POST" and request.form.get("mark_read") == "1":
-        (Notification.query
-         .filter_by(user_id=current_user.id, is_read=False)
-         .update({Notification.is_read: True}))
-        db.session.commit()
+        mark_all_read(current_user.id, app.config['NOTIFICATION_MARK_READ_BATCH'])
         flash("Đã đánh dấu tất cả là đã đọc.", "success")
         return redirect(url_for("notifications"))
 
-    # sắp xếp: chưa đọc trước, mới nhất trước
-    notifs = (
+    # sắp xếp: chưa đọc trước, mới nhất trước; phân trang theo (is_read, created_at, id)
+    q = (
         Notification.query
+        .options(joinedload(Notification.task), joinedload(Notification.actor))
         .filter_by(user_id=current_user.id)
-        .order_by(Notification.is_read.asc(), Notification.created_at.desc())
+    )
+    cursor = parse_notif_cursor(request.args.get("after"))
+    if cursor:
+        is_read, created_at, notif_id = cursor
+        after = sa.and_(Notification.is_read == is_read, sa.or_(
+            Notification.created_at < created_at,
+            sa.and_(Notification.created_at == created_at, Notification.id < notif_id),
+        ))
+        # chưa đọc (False) đứng trước: đang ở nhóm chưa đọc thì còn cả nhóm đã đọc phía sau
+        q = q.filter(after if is_read else sa.or_(after, Notification.is_read == sa.true()))
+    page_size = app.config['NOTIFICATION_PAGE_SIZE']
+    notifs = (
+        q.order_by(Notification.is_read.asc(), Notification.created_at.desc(), Notification.id.desc())
+        .limit(page_size + 1)
         .all()
     )
-    return render_template("notifications.html", notifs=notifs)
+    next_cursor = None
+    if len(notifs) > page_size:
+        notifs = notifs[:page_size]
+        last = notifs[-1]
+        next_cursor = f"{int(last.is_read)}_{last.created_at.isoformat()}_{last.id}"
+    return render_template("notifications.html", notifs=notifs, next_cursor=next_cursor,
+                           is_first_page=cursor is None)
+
+
+def parse_notif_cursor(value):
+    """Cursor dạng '<is_read>_<created_at iso>_<id>', không hợp lệ thì trả None."""
+    if not value:
+        return None
+    try:
+        is_read, created_at, notif_id = value.split("_")
+        return bool(int(is_read)), datetime.fromisoformat(created_at), int(notif_id)
+    except ValueError:
+        return None
+
+
+def mark_all_read(user_id: int, batch_size: int = 0) -> int:
+    """Đánh dấu đã đọc; batch_size > 0 thì UPDATE + commit theo từng lô để không khoá bảng lâu."""
+    unread = sa.and_(Notification.user_id == user_id, Notification.is_read == sa.false())
+    if not batch_size:
+        n = _bulk(sa.update(Notification).where(unread).values(is_read=True)).rowcount
+        db.session.commit()
+        return n
+    total = 0
+    while True:
+        ids = db.session.scalars(sa.select(Notification.id).where(unread).limit(batch_size)).all()
+        if not ids:
+            return total
+        _bulk(sa.update(Notification).where(Notification.id.in_(ids)).values(is_read=True))
+        db.session.commit()
+        total += len(ids)
+
+
+def archive_notifications(days: int, batch_size: int = 1000) -> int:
+    """Chuyển thông báo đã đọc cũ hơn `days` ngày sang notification_archive, theo từng lô."""
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    cols = ["user_id", "task_id", "actor_id", "type", "message", "created_at"]
+    total = 0
+    while True:
+        ids = db.session.scalars(
+            sa.select(Notification.id)
+            .where(Notification.is_read == sa.true(), Notification.created_at < cutoff)
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return total
+        db.session.execute(sa.insert(NotificationArchive).from_select(
+            ["notification_id", *cols],
+            sa.select(Notification.id, *(getattr(Notification, c) for c in cols)).where(Notification.id.in_(ids)),
+        ))
+        _bulk(sa.delete(Notification).where(Notification.id.in_(ids)))
+        db.session.commit()
+        total += len(ids)
 
 
 @app.route("/notifications/<int:notif_id>/open")
+@primary_db
 @login_required
 def notification_open(notif_id):
     n = (Notification.query
@@ -654,28 +1045,64 @@ def notification_delete(notif_id):
     return redirect(url_for("notifications"))
 
 
-@app.route("/my-tasks")
-@login_required
-def my_tasks():
-    me_id = current_user.id
+# -------------------- My tasks inbox --------------------
+INBOX_GROUPS = ("others", "self")
 
-    # Tất cả task mà bạn được assign (kể cả tự assign)
-    assigned = (
-        Task.query
-        .join(task_assignees)
+def _inbox_filter(me_id: int, group: str):
+    """'self' = mình tự giao; 'others' = người khác giao (kể cả task không rõ người tạo)."""
+    if group == "self":
+        return Task.created_by_id == me_id
+    return sa.or_(Task.created_by_id != me_id, Task.created_by_id.is_(None))
+
+def inbox_stats(me_id: int):
+    """Số task và histogram trạng thái của cả 2 nhóm bằng 1 câu aggregate."""
+    self_cnt = func.sum(case((Task.created_by_id == me_id, 1), else_=0))
+    rows = (
+        db.session.query(Task.status, func.count(Task.id), self_cnt)
+        .join(task_assignees, task_assignees.c.task_id == Task.id)
         .filter(task_assignees.c.user_id == me_id)
+        .group_by(Task.status)
+        .all()
+    )
+    stats = {g: {"total": 0, "status": {"In process": 0, "Done": 0, "OverDue": 0}} for g in INBOX_GROUPS}
+    for status, total, mine in rows:
+        mine = int(mine or 0)
+        for g, cnt in (("self", mine), ("others", total - mine)):
+            stats[g]["total"] += cnt
+            stats[g]["status"][status] = stats[g]["status"].get(status, 0) + cnt
+    return stats
+
+def inbox_page(me_id: int, group: str, page: int, per_page: int):
+    """1 trang task của nhóm, kèm list + board (template chỉ dùng 2 quan hệ này)."""
+    return (
+        Task.query
+        .options(joinedload(Task.list).joinedload(List.board))
+        .join(task_assignees, task_assignees.c.task_id == Task.id)
+        .filter(task_assignees.c.user_id == me_id, _inbox_filter(me_id, group))
         .order_by(Task.due_date.asc().nulls_last(), Task.id.desc())
+        .limit(per_page)
+        .offset((page - 1) * per_page)
         .all()
     )
 
-    # Chia 2 nhóm: người khác giao cho mình / mình tự giao cho mình
-    self_assigned = [t for t in assigned if (t.created_by_id == me_id)]
-    from_others   = [t for t in assigned if (t.created_by_id != me_id)]
+
+@app.route("/my-tasks")
+@login_required
+def my_tasks():
+    me_id = current_user.id
+    per_page = app.config['MY_TASKS_PAGE_SIZE']
+
+    # Chia 2 nhóm ngay trong SQL: người khác giao cho mình / mình tự giao cho mình
+    stats = inbox_stats(me_id)
+    pages = {g: max(request.args.get(f"{g}_page", 1, type=int), 1) for g in INBOX_GROUPS}
 
     return render_template(
         "my_tasks.html",
-        from_others=from_others,
-        self_assigned=self_assigned
+        from_others=inbox_page(me_id, "others", pages["others"], per_page),
+        self_assigned=inbox_page(me_id, "self", pages["self"], per_page),
+        stats=stats,
+        pages=pages,
+        per_page=per_page,
     )
 @app.route("/all_tasks")
 @login_required
@@ -729,9 +1156,10 @@ def delete_member(user_id):
         flash("Bạn không thể xoá chính mình.", "warning")
         return redirect(url_for("members"))
 
-    db.session.delete(u)
+    name = u.name
+    delete_user_rows(u.id)
     db.session.commit()
-    flash(f"Đã xoá thành viên {u.name}.", "success")
+    flash(f"Đã xoá thành viên {name}.", "success")
     return redirect(url_for("members"))  
 # CLI helper to init db
 @app.cli.command("init-db")
@@ -739,6 +1167,78 @@ def init_db():
     db.create_all()
     print("Database initialized.")
 
+
+@app.cli.command("sync-replicas")
+def sync_replicas():
+    """Chép DB primary sang các replica SQLite (dùng để test local)."""
+    primary = db.engines[None]
+    for key in REPLICA_KEYS:
+        engine = db.engines[key]
+        if primary.dialect.name != "sqlite" or engine.dialect.name != "sqlite":
+            print(f"Bỏ qua {key}: chỉ hỗ trợ SQLite, replica thật do DB tự đồng bộ.")
+            continue
+        src = primary.raw_connection()
+        dst = engine.raw_connection()
+        try:
+            src.driver_connection.backup(dst.driver_connection)
+        finally:
+            dst.close()
+            src.close()
+        print(f"Đã đồng bộ {key}.")
+
+
+@app.cli.command("archive-notifications")
+@click.option("--days", type=int, default=None, help="Mặc định lấy NOTIFICATION_RETENTION_DAYS.")
+@click.option("--batch", default=1000, show_default=True, help="Số dòng mỗi lô.")
+def archive_notifications_cmd(days, batch):
+    """Chuyển thông báo đã đọc cũ sang bảng notification_archive."""
+    if days is None:
+        days = app.config['NOTIFICATION_RETENTION_DAYS']
+    n = archive_notifications(days, batch)
+    print(f"Đã lưu trữ {n} thông báo cũ hơn {days} ngày.")
+
+
+@app.cli.command("bench-delete-board")
+@click.option("--tasks", default=50000, show_default=True, help="Số task trong board thử.")
+@click.option("--lists", default=10, show_default=True, help="Số danh sách trong board thử.")
+def bench_delete_board(tasks, lists):
+    """Đo thời gian xoá set-based một board nhiều task, trên file SQLite tạm (không đụng DB thật)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = sa.create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        db.metadata.create_all(engine)
+        try:
+            with sa.orm.Session(engine) as sess:
+                owner = User(name="bench", email="bench@example.invalid", password_hash="-")
+                board = Board(name="bench-delete", owner=owner)
+                sess.add(board)
+                sess.flush()
+                list_ids = []
+                for i in range(lists):
+                    lst = List(title=f"bench {i}", board_id=board.id, position=i + 1)
+                    sess.add(lst)
+                    sess.flush()
+                    list_ids.append(lst.id)
+                sess.execute(sa.insert(Task), [
+                    {"title": f"bench task {i}", "list_id": list_ids[i % lists], "position": i}
+                    for i in range(tasks)
+                ])
+                task_ids = sess.scalars(sa.select(Task.id).where(Task.list_id.in_(list_ids))).all()
+                sess.execute(sa.insert(task_assignees),
+                          [{"task_id": tid, "user_id": owner.id} for tid in task_ids])
+                sess.execute(sa.insert(Notification), [
+                    {"user_id": owner.id, "task_id": tid, "type": "assigned", "message": "bench"}
+                    for tid in task_ids[::10]
+                ])
+                sess.commit()
+
+                started = time.perf_counter()
+                deleted = delete_board_rows(board.id, sess)
+                sess.commit()
+                elapsed = time.perf_counter() - started
+        finally:
+            engine.dispose()
+    print(f"Đã xoá board với {deleted} task trong {elapsed:.3f}s.")
+
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
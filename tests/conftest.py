@@ -0,0 +1,28 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Cấu hình DB tạm trước khi import app (app đọc biến môi trường lúc import)
+_tmpdir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(_tmpdir, "test.db")
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app as flask_app, db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    flask_app.config["TESTING"] = True
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,100 @@
+import sqlalchemy as sa
+
+from app import db, User, Board, List, Task, Notification, task_assignees
+
+
+def login(client, email="me@x", name="me"):
+    client.post("/register", data=dict(name=name, email=email, password="secret1"))
+    client.post("/login", data=dict(email=email, password="secret1"))
+    return User.query.filter_by(email=email).one()
+
+
+def setup_tasks(client):
+    me = login(client)
+    other = User(name="other", email="other@x", password_hash="-")
+    lst = List(title="L", board=Board(name="B", owner_id=me.id))
+    db.session.add_all([other, lst])
+    db.session.flush()
+    t1 = Task(title="t1", list_id=lst.id, created_by_id=other.id, status="In process")
+    t2 = Task(title="t2", list_id=lst.id, created_by_id=me.id, status="Done")
+    db.session.add_all([t1, t2])
+    db.session.flush()
+    db.session.execute(sa.insert(task_assignees), [
+        {"task_id": t1.id, "user_id": me.id},
+        {"task_id": t1.id, "user_id": other.id},
+        {"task_id": t2.id, "user_id": me.id},
+    ])
+    db.session.commit()
+    return me, other, lst, t1.id, t2.id
+
+
+def count_inserts(table):
+    stmts = []
+
+    def on_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith(f"INSERT INTO {table.upper()} "):
+            stmts.append(statement)
+
+    return stmts, on_execute
+
+
+def test_bulk_json_results_and_batched_completion(app, client):
+    me, other, _, t1, t2 = setup_tasks(client)
+    stmts, on_execute = count_inserts("notification")
+    sa.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        resp = client.post("/tasks/bulk", json={"task_ids": [t1, t2, 999, "x", True], "status": "Done"})
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+    assert resp.status_code == 200
+    body = resp.get_json()
+    results = {str(r["id"]): r for r in body["results"]}
+    assert results[str(t1)] == {"id": t1, "ok": True, "changed": ["status"], "completed": True}
+    assert results[str(t2)] == {"id": t2, "ok": True, "changed": [], "completed": False}
+    assert results["999"]["error"] == "not found"
+    assert results["x"]["error"] == "invalid id"
+    assert results["True"]["error"] == "invalid id"
+    assert body["updated"] == 1
+
+    # 1 câu INSERT cho thông báo hoàn thành, không gửi cho chính người thao tác
+    assert len(stmts) == 1
+    notifs = Notification.query.all()
+    assert [(n.user_id, n.task_id, n.type) for n in notifs] == [(other.id, t1, "completed")]
+
+
+def test_bulk_assignees_json(app, client):
+    me, other, _, t1, t2 = setup_tasks(client)
+    resp = client.post("/tasks/bulk", json={"task_ids": [t2], "add_assignees": [other.id, me.id]})
+    assert resp.get_json()["results"][0]["changed"] == ["add_assignees"]
+    assert [(n.user_id, n.type) for n in Notification.query.all()] == [(other.id, "assigned")]
+
+    resp = client.post("/tasks/bulk", json={"task_ids": [t1, t2], "remove_assignees": [other.id]})
+    assert [r["changed"] for r in resp.get_json()["results"]] == [["remove_assignees"], ["remove_assignees"]]
+    left = db.session.execute(sa.select(task_assignees.c.user_id).distinct()).scalars().all()
+    assert left == [me.id]
+
+
+def test_bulk_form_payload(app, client):
+    _, _, lst, t1, t2 = setup_tasks(client)
+    resp = client.post("/tasks/bulk", data={"task_ids": [str(t1), str(t2)], "priority": "Urgent",
+                                            "board_id": str(lst.board_id)})
+    assert resp.status_code == 302
+    assert resp.headers["Location"].endswith(f"/boards/{lst.board_id}")
+    assert {t.priority for t in Task.query.all()} == {"Urgent"}
+
+
+def test_bulk_rejects_bad_payloads(app, client):
+    _, _, _, t1, _ = setup_tasks(client)
+    for body in (
+        {"task_ids": str(t1), "status": "Done"},
+        {"task_ids": t1, "status": "Done"},
+        {"task_ids": [t1], "status": 5},
+        {"task_ids": [t1], "add_assignees": ["x"]},
+        {"task_ids": [t1]},
+        [t1],
+    ):
+        resp = client.post("/tasks/bulk", json=body)
+        assert resp.status_code == 400, body
+        assert "error" in resp.get_json()
+    assert db.session.get(Task, t1).status == "In process"
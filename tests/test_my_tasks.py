@@ -0,0 +1,73 @@
+import sqlalchemy as sa
+
+from app import db, User, Board, List, Task, task_assignees
+
+EXPECTED_QUERIES = 5  # load_user, unread count, aggregate, 2 trang (others/self)
+
+
+def login(client, email="me@x", name="me"):
+    client.post("/register", data=dict(name=name, email=email, password="secret1"))
+    client.post("/login", data=dict(email=email, password="secret1"))
+    return User.query.filter_by(email=email).one()
+
+
+def seed_assigned(me, other, n):
+    # mỗi task một list/board riêng để lazy-load list/board sẽ lộ ra thành N+1
+    lists = [List(title=f"L{i}", board=Board(name=f"B{i}", owner_id=me.id)) for i in range(n)]
+    db.session.add_all(lists)
+    db.session.flush()
+    rows = [
+        {"title": f"t{i}", "list_id": lists[i].id, "position": i,
+         "created_by_id": (me.id, other.id, None)[i % 3],
+         "status": ("In process", "Done", "OverDue")[i % 3]}
+        for i in range(n)
+    ]
+    db.session.execute(sa.insert(Task), rows)
+    ids = db.session.scalars(sa.select(Task.id).where(Task.list_id.in_([l.id for l in lists]))).all()
+    db.session.execute(sa.insert(task_assignees), [{"task_id": tid, "user_id": me.id} for tid in ids])
+    db.session.commit()
+
+
+def count_queries(client, url):
+    count = [0]
+
+    def on_execute(*args):
+        count[0] += 1
+
+    engine = db.engine
+    sa.event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        resp = client.get(url)
+    finally:
+        sa.event.remove(engine, "before_cursor_execute", on_execute)
+    assert resp.status_code == 200
+    return count[0]
+
+
+def test_my_tasks_query_count_is_constant(app, client):
+    other = User(name="other", email="other@x", password_hash="-")
+    db.session.add(other)
+    db.session.commit()
+    me = login(client)
+
+    n = 6
+    seed_assigned(me, other, n)
+    small = count_queries(client, "/my-tasks")
+
+    seed_assigned(me, other, 10 * n - n)  # tổng cộng 10×N task
+    large = count_queries(client, "/my-tasks")
+
+    assert small == large == EXPECTED_QUERIES
+
+
+def test_my_tasks_groups_and_counts(app, client):
+    other = User(name="other", email="other@x", password_hash="-")
+    db.session.add(other)
+    db.session.commit()
+    me = login(client)
+    seed_assigned(me, other, 9)
+
+    html = client.get("/my-tasks").get_data(as_text=True)
+    # 3 task tự giao, 6 task người khác giao (kể cả không rõ người tạo)
+    assert '<span class="badge text-bg-secondary">6</span>' in html
+    assert '<span class="badge text-bg-secondary">3</span>' in html
@@ -0,0 +1,108 @@
+import re
+from datetime import date, datetime, timedelta
+
+import sqlalchemy as sa
+
+from app import (db, User, Board, List, Task, Notification, NotificationArchive, task_assignees,
+                 archive_notifications, mark_all_read)
+
+
+def login(client, email="me@x", name="me"):
+    client.post("/register", data=dict(name=name, email=email, password="secret1"))
+    client.post("/login", data=dict(email=email, password="secret1"))
+    return User.query.filter_by(email=email).one()
+
+
+def add_notifs(user_id, rows):
+    db.session.execute(sa.insert(Notification), [
+        {"user_id": user_id, "type": "assigned", "message": msg, "is_read": is_read, "created_at": created_at}
+        for msg, is_read, created_at in rows
+    ])
+    db.session.commit()
+
+
+def test_keyset_pages_cover_every_row_once(app, client, monkeypatch):
+    me = login(client)
+    monkeypatch.setitem(app.config, "NOTIFICATION_PAGE_SIZE", 4)
+    base = datetime(2026, 1, 1)
+    # nhiều dòng trùng created_at để kiểm tra tie-break theo id, ranh giới chưa đọc -> đã đọc giữa trang
+    add_notifs(me.id, [(f"m{i}", i % 3 == 0, base + timedelta(hours=i // 3)) for i in range(18)])
+    expected = [n.message for n in Notification.query.order_by(
+        Notification.is_read.asc(), Notification.created_at.desc(), Notification.id.desc())]
+
+    seen, url, pages = [], "/notifications", 0
+    while url:
+        html = client.get(url).get_data(as_text=True)
+        seen += re.findall(r'fw-semibold">(m\d+)<', html)
+        m = re.search(r'href="(/notifications\?after=[^"]+)"', html)
+        url = m.group(1) if m else None
+        pages += 1
+
+    assert seen == expected
+    assert len(set(seen)) == 18
+    assert pages == 5
+
+
+def test_mark_all_read_in_batches(app, client):
+    me = login(client)
+    other = User(name="other", email="other@x", password_hash="-")
+    db.session.add(other)
+    db.session.commit()
+    now = datetime.utcnow()
+    add_notifs(me.id, [(f"m{i}", False, now) for i in range(11)])
+    add_notifs(other.id, [("x", False, now)])
+
+    updates = []
+
+    def on_execute(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("UPDATE NOTIFICATION"):
+            updates.append(statement)
+
+    sa.event.listen(db.engine, "before_cursor_execute", on_execute)
+    try:
+        assert mark_all_read(me.id, batch_size=4) == 11
+    finally:
+        sa.event.remove(db.engine, "before_cursor_execute", on_execute)
+
+    assert len(updates) == 3
+    assert Notification.query.filter_by(user_id=me.id, is_read=False).count() == 0
+    assert Notification.query.filter_by(user_id=other.id, is_read=False).count() == 1
+
+
+def test_archive_moves_only_old_read_rows(app, client):
+    me = login(client)
+    old = datetime.utcnow() - timedelta(days=120)
+    recent = datetime.utcnow() - timedelta(days=1)
+    add_notifs(me.id, [("old-read", True, old)] * 5 + [("old-unread", False, old)] * 2
+               + [("recent-read", True, recent)] * 2)
+    old_ids = set(db.session.scalars(sa.select(Notification.id).where(Notification.message == "old-read")))
+
+    assert archive_notifications(90, batch_size=2) == 5
+
+    assert Notification.query.count() == 4
+    assert Notification.query.filter_by(message="old-read").count() == 0
+    archived = NotificationArchive.query.all()
+    assert {a.notification_id for a in archived} == old_ids
+    assert {(a.user_id, a.message, a.created_at) for a in archived} == {(me.id, "old-read", old)}
+
+
+def test_archived_overdue_notification_is_not_recreated(app, client):
+    me = login(client)
+    lst = List(title="L", board=Board(name="B", owner_id=me.id))
+    task = Task(title="late", list=lst, created_by_id=me.id, status="In process",
+                due_date=date.today() - timedelta(days=3))
+    db.session.add(task)
+    db.session.flush()
+    db.session.execute(sa.insert(task_assignees).values(task_id=task.id, user_id=me.id))
+    db.session.commit()
+
+    client.get("/notifications")
+    assert [(n.type, n.is_read) for n in Notification.query.all()] == [("overdue", False)]
+    client.post("/notifications", data={"mark_read": "1"})
+    db.session.execute(sa.update(Notification).values(created_at=datetime.utcnow() - timedelta(days=120)))
+    db.session.commit()
+    assert archive_notifications(90) == 1
+
+    client.get("/notifications")
+    assert Notification.query.count() == 0
+    assert NotificationArchive.query.count() == 1
@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Chạy trong process riêng: app đọc DATABASE_REPLICA_URLS lúc import, còn conftest thì tắt replica.
+SCRIPT = textwrap.dedent("""
+    import json
+    import sqlalchemy as sa
+    from flask import g
+    from app import app, db, Notification
+
+    used = []
+    with app.app_context():
+        db.create_all()
+        for key, engine in db.engines.items():
+            sa.event.listen(engine, "before_cursor_execute",
+                            lambda *a, key=key: used.append(key or "primary"))
+
+    def get(client, url):
+        used.clear()
+        resp = client.get(url)
+        return resp, sorted(set(used))
+
+    def end_sticky(client):
+        with client.session_transaction() as s:
+            s.pop("rw_until", None)
+
+    out = {}
+    c = app.test_client()
+    c.post("/register", data=dict(name="a", email="a@x", password="secret1"))
+    c.post("/login", data=dict(email="a@x", password="secret1"))
+    with app.app_context():
+        db.session.add(Notification(user_id=1, type="assigned", message="hi"))
+        db.session.commit()
+    app.test_cli_runner().invoke(args=["sync-replicas"])
+    end_sticky(c)
+
+    out["round_robin"] = [get(c, "/boards")[1] for _ in range(4)]
+
+    c.post("/boards", data=dict(name="fresh-board"))
+    resp, binds = get(c, "/boards")
+    out["after_write"] = [binds, "fresh-board" in resp.get_data(as_text=True)]
+    end_sticky(c)
+    resp, binds = get(c, "/boards")
+    out["after_sticky"] = [binds, "fresh-board" in resp.get_data(as_text=True)]
+
+    end_sticky(c)
+    out["notifications"] = get(c, "/notifications")[1]
+    end_sticky(c)
+    out["notification_open"] = get(c, "/notifications/1/open")[1]
+    print(json.dumps(out))
+""")
+
+
+def test_replica_routing(tmp_path):
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{tmp_path / 'primary.db'}"
+    env["DATABASE_REPLICA_URLS"] = f"sqlite:///{tmp_path / 'r1.db'},sqlite:///{tmp_path / 'r2.db'}"
+    env["REPLICA_STICKY_SECONDS"] = "60"
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    proc = subprocess.run([sys.executable, "-c", SCRIPT], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    out = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # GET chỉ đọc luân phiên giữa 2 replica
+    rr = out["round_robin"]
+    assert all(len(binds) == 1 and binds[0].startswith("replica_") for binds in rr)
+    assert [b[0] for b in rr] == [rr[0][0], rr[1][0]] * 2
+    assert rr[0] != rr[1]
+
+    # Ngay sau POST: đọc primary và thấy dữ liệu mới (read-your-writes)
+    assert out["after_write"] == [["primary"], True]
+    # Hết cửa sổ sticky: quay lại replica (chưa sync nên chưa thấy board mới)
+    binds, visible = out["after_sticky"]
+    assert binds[0].startswith("replica_") and len(binds) == 1
+    assert visible is False
+
+    # View @primary_db không bao giờ dùng replica
+    assert out["notifications"] == ["primary"]
+    assert out["notification_open"] == ["primary"]